@@ -1,8 +1,99 @@
+import math
+from collections import deque
+from dataclasses import dataclass, field
+
 from jesse.strategies import Strategy, cached
 from jesse import utils
+import jesse.helpers as jh
 import jesse.indicators as ta
+from jesse.exceptions import RouteNotFound
 import numpy as np
 
+from ._kernels import rsi_step, ema_last, ema_last_windows, wilder_atr_step, momentum_updown, compute_sl_tp
+
+
+def _window_count(flags, window):
+    """
+    Number of True values in the trailing `window` rows (current row included),
+    where `window` holds one length per column of `flags`.
+    """
+    counts = np.cumsum(flags, axis=0)
+    counts = np.vstack([np.zeros((1, flags.shape[1])), counts])
+    start = np.maximum(np.arange(1, len(counts))[:, None] - window[None, :], 0)
+    return counts[1:] - np.take_along_axis(counts, start, axis=0)
+
+
+@dataclass
+class _StreamingState:
+    """
+    Running state of one indicator, updated one candle at a time.
+
+    Each indicator method takes a candle row and returns the indicator value
+    including that candle. With commit=True the candle is folded into the
+    state, otherwise the state is left untouched.
+
+    RSI and ATR are smoothed over the whole candle history, where ta.rsi and
+    ta.atr restart at the trailing indicator window. Their difference shrinks
+    with the weight Wilder's smoothing has left on the window's seed,
+    ((period - 1) / period) ** (window - period): about 5e-8 at period 14 but
+    1.3e-5 at period 20, the top of the hyperparameter ranges. The EMAs are not
+    streamed, as their seed keeps far more weight (see ema_last).
+    """
+    period: int
+    last_ts: float = -np.inf
+    count: int = 0
+    prev_close: float = np.nan
+    avg_gain: float = 0.0
+    avg_loss: float = 0.0
+    atr_value: float = 0.0
+    sma_sum: float = 0.0
+    sma_window: deque = field(default_factory=deque)
+
+    def rsi(self, candle, commit):
+        close = candle[2]
+        value = np.nan
+        if self.count:
+            # Averages over the first `period` changes are plain means (Wilder's seed)
+            n = min(self.count, self.period)
+            avg_gain, avg_loss = rsi_step(self.avg_gain, self.avg_loss, close - self.prev_close, n)
+            value = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+            if commit:
+                self.avg_gain, self.avg_loss = avg_gain, avg_loss
+        if commit:
+            self.prev_close = close
+            self.count += 1
+        return value
+
+    def true_range(self, candle):
+        high, low = candle[3], candle[4]
+        if not self.count:
+            return high - low
+        return max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+
+    def atr(self, candle, commit):
+        n = min(self.count + 1, self.period)
+        value = wilder_atr_step(self.atr_value, self.true_range(candle), n)
+        if commit:
+            self.atr_value = value
+            self.prev_close = candle[2]
+            self.count += 1
+        return value
+
+    def sma(self, candle, commit):
+        volume = candle[5]
+        window = self.sma_window
+        total = self.sma_sum + volume
+        size = len(window) + 1
+        if size > self.period:
+            total -= window[0]
+            size -= 1
+        if commit:
+            window.append(volume)
+            if len(window) > self.period:
+                window.popleft()
+            self.sma_sum = total
+        return total / size
+
 
 class RSI5MinStrategy(Strategy):
     """
@@ -17,6 +108,39 @@ class RSI5MinStrategy(Strategy):
     - ATR-based risk management
     """
 
+    # Slots for the strategy's own per-bar state. Strategy keeps its __dict__ for
+    # everything else, these just get faster descriptor access.
+    __slots__ = (
+        '_streams', '_momentum_cache', '_htf_ema_memo', '_hp_bound', '_htf_available', '_entry_candle_index', '_window',
+        '_rsi_tail', '_rsi_tail_size',
+        '_rsi_period', '_rsi_ob', '_rsi_os', '_mom_p', '_ema_fast_period', '_ema_slow_period',
+        '_use_trend', '_htf_period', '_atr_period', '_use_vol', '_max_hold',
+        '_sl_mult', '_tp_mult', '_risk_pct', '_fee_rate', '_max_cap_size_factor',
+    )
+
+    # Entry checks per (use_trend_filter, use_volume_filter), bound in _bind_hp()
+    _ENTRY_VARIANTS = {
+        (True, True): ('_should_long_trend_vol', '_should_short_trend_vol'),
+        (True, False): ('_should_long_trend_novol', '_should_short_trend_novol'),
+        (False, True): ('_should_long_notrend_vol', '_should_short_notrend_vol'),
+        (False, False): ('_should_long_notrend_novol', '_should_short_notrend_novol'),
+    }
+
+    def __init__(self):
+        super().__init__()
+        # Streaming indicator states, keyed by (kind, exchange, symbol, timeframe, period)
+        self._streams = {}
+        # (index, up, down) of the last RSI momentum evaluation
+        self._momentum_cache = None
+        # (newest 15m candle's (timestamp, close), higher_tf_ema) of the last computation
+        self._htf_ema_memo = None
+        # Hyperparameters are fixed for the whole run, see _bind_hp()
+        self._hp_bound = False
+        # Whether a 15m data route exists, checked once in before()
+        self._htf_available = None
+        # Candle index of the latest entry order, -1 while flat
+        self._entry_candle_index = -1
+
     def hyperparameters(self):
         """
         15 optimizable hyperparameters for comprehensive strategy optimization
@@ -51,92 +175,193 @@ class RSI5MinStrategy(Strategy):
             {'name': 'max_capital_per_trade', 'type': float, 'min': 0.05, 'max': 0.5, 'default': 0.15}
         ]
 
+    def before(self):
+        if not self._hp_bound:
+            self._bind_hp()
+        if self._htf_available is None:
+            # Probed once per run rather than by catching the error on every bar
+            try:
+                self.get_candles(self.exchange, self.symbol, '15m')
+                self._htf_available = True
+            except RouteNotFound:
+                self._htf_available = False
+        
+        # Shift this bar's RSI into the momentum buffer
+        tail = self._rsi_tail
+        if self._rsi_tail_size:
+            tail[:-1] = tail[1:]
+            tail[-1] = self.rsi
+            if self._rsi_tail_size < len(tail):
+                self._rsi_tail_size += 1
+        else:
+            # First bar: the earlier values come from the warm-up candles, like
+            # ta.rsi(sequential=True) gave them, instead of filling up bar by bar
+            history = ta.rsi(self.candles, period=self._rsi_period, sequential=True)[-len(tail):]
+            tail[len(tail) - len(history):] = history
+            tail[-1] = self.rsi
+            self._rsi_tail_size = len(history)
+
+    def _bind_hp(self):
+        """Copy the hyperparameters read on every bar or entry into plain attributes"""
+        # Trailing window the ta.* indicators slice to (jh.slice_candles), read once instead of per bar
+        self._window = int(jh.get_config('env.data.warmup_candles_num', 240))
+        
+        hp = self.hp
+        self._rsi_period = hp['rsi_period']
+        self._rsi_ob = hp['rsi_overbought']
+        self._rsi_os = hp['rsi_oversold']
+        self._mom_p = hp['rsi_momentum_period']
+        self._ema_fast_period = hp['trend_ema_fast']
+        self._ema_slow_period = hp['trend_ema_slow']
+        self._use_trend = hp['use_trend_filter']
+        self._htf_period = hp['higher_tf_period']
+        self._atr_period = hp['atr_period']
+        self._use_vol = hp['use_volume_filter']
+        self._max_hold = hp['max_hold_candles']
+        self._sl_mult = hp['stop_loss_atr_mult']
+        self._tp_mult = hp['take_profit_atr_mult']
+        self._risk_pct = hp['risk_percentage']
+        self._fee_rate = self.fee_rate
+        # Share of capital per trade, net of the fee allowance utils.size_to_qty() applies
+        self._max_cap_size_factor = hp['max_capital_per_trade'] * (1 - self._fee_rate * 3)
+
+        # Last rsi_momentum_period + 1 RSI values, oldest first
+        self._rsi_tail = np.full(self._mom_p + 1, np.nan)
+        self._rsi_tail_size = 0
+        # Compile (or load) the momentum kernel now rather than on the first signal
+        momentum_updown(self._rsi_tail)
+
+        # Swap in the entry checks specialized for this run's filter switches
+        long_check, short_check = self._ENTRY_VARIANTS[(bool(self._use_trend), bool(self._use_vol))]
+        self.should_long = getattr(self, long_check)
+        self.should_short = getattr(self, short_check)
+
+        self._hp_bound = True
+
     # ========== INDICATOR PROPERTIES ==========
     
     @property
     @cached
     def rsi(self):
         """Current RSI value"""
-        return ta.rsi(self.candles, period=self.hp['rsi_period'])
+        return self._stream('rsi', self.timeframe, self.candles, self._rsi_period)
     
     @property
-    @cached
     def rsi_seq(self):
-        """RSI sequence for momentum analysis"""
-        return ta.rsi(self.candles, period=self.hp['rsi_period'], sequential=True)
+        """RSI sequence for momentum analysis (the last rsi_momentum_period + 1 values at most)"""
+        return self._rsi_tail[len(self._rsi_tail) - self._rsi_tail_size:]
     
     @property
     @cached
     def ema_fast(self):
         """Fast EMA for trend detection"""
-        return ta.ema(self.candles, period=self.hp['trend_ema_fast'])
+        return self._ema(self.candles, self._ema_fast_period)
     
     @property
     @cached
     def ema_slow(self):
         """Slow EMA for trend detection"""
-        return ta.ema(self.candles, period=self.hp['trend_ema_slow'])
+        return self._ema(self.candles, self._ema_slow_period)
     
     @property
     @cached
     def atr(self):
         """Average True Range for volatility-based stops"""
-        return ta.atr(self.candles, period=self.hp['atr_period'])
+        return self._stream('atr', self.timeframe, self.candles, self._atr_period)
     
     @property
     @cached
     def volume_sma(self):
         """Volume moving average for volume filter"""
-        return ta.sma(self.candles, period=20, source_type="volume")
+        return self._stream('sma', self.timeframe, self.candles, 20)
     
     @property
     @cached
     def higher_tf_ema(self):
         """Higher timeframe EMA for trend alignment"""
         # Use 15min candles for higher timeframe analysis on 5min strategy
-        try:
+        if self._htf_available:
             htf_candles = self.get_candles(self.exchange, self.symbol, '15m')
-            return ta.ema(htf_candles, period=self.hp['higher_tf_period'])
-        except:
-            # Fallback to current timeframe if higher timeframe not available
-            return ta.ema(self.candles, period=self.hp['higher_tf_period'])
+            # The 15m window only moves every third 5m bar, and until its newest
+            # candle ticks (new timestamp or close) the EMA can't change
+            newest = (htf_candles[-1, 0], htf_candles[-1, 2]) if len(htf_candles) else None
+            memo = self._htf_ema_memo
+            if memo is not None and memo[0] == newest:
+                return memo[1]
+            value = self._ema(htf_candles, self._htf_period)
+            self._htf_ema_memo = (newest, value)
+            return value
+        
+        # Fallback to current timeframe if higher timeframe not available
+        return self._ema(self.candles, self._htf_period)
+    
+    def _ema(self, candles, period):
+        """ta.ema of the closes: over the indicator window, NaN while it is shorter than `period`"""
+        return ema_last(candles[-self._window:, 2], period)
+
+    def _stream(self, kind, timeframe, candles, period):
+        """
+        Advance the streaming state of an indicator and return its current value.
+
+        Candles already folded into the state are skipped, so a bar usually costs
+        a single step. The newest candle may still be forming (higher timeframes),
+        hence it is only evaluated here and gets committed once a newer one shows up.
+        """
+        if not len(candles):
+            return np.nan
+
+        state = self._stream_state(kind, timeframe, candles, period)
+        return getattr(state, kind)(candles[-1], False)
+
+    def _stream_state(self, kind, timeframe, candles, period):
+        """Streaming state of an indicator with every candle but the newest one folded in"""
+        key = (kind, self.exchange, self.symbol, timeframe, period)
+        state = self._streams.get(key)
+        if state is None:
+            state = self._streams[key] = _StreamingState(period)
+
+        step = getattr(state, kind)
+        last = len(candles) - 1
+        start = last
+        while start > 0 and candles[start - 1, 0] > state.last_ts:
+            start -= 1
+        for i in range(start, last):
+            step(candles[i], True)
+            state.last_ts = candles[i, 0]
+
+        return state
 
     # ========== HELPER METHODS ==========
     
+    def _rsi_momentum(self):
+        """Number of rising and falling RSI steps over the momentum period (computed once per bar)"""
+        cache = self._momentum_cache
+        if cache is not None and cache[0] == self.index:
+            return cache[1], cache[2]
+        
+        if self._rsi_tail_size < len(self._rsi_tail):
+            up = down = -1  # not enough RSI history yet
+        else:
+            up, down = momentum_updown(self._rsi_tail)
+        
+        self._momentum_cache = (self.index, up, down)
+        return up, down
+    
     def rsi_momentum_bullish(self):
         """Check if RSI has bullish momentum over recent candles"""
-        if len(self.rsi_seq) < self.hp['rsi_momentum_period'] + 1:
-            return False
-        
-        recent_rsi = self.rsi_seq[-self.hp['rsi_momentum_period']-1:]
-        # Check if RSI is generally increasing over the momentum period
-        momentum_count = 0
-        for i in range(1, len(recent_rsi)):
-            if recent_rsi[i] > recent_rsi[i-1]:
-                momentum_count += 1
-        
         # Require majority of recent candles to show upward RSI momentum
-        return momentum_count >= (len(recent_rsi) - 1) // 2
+        return self._rsi_momentum()[0] >= self._mom_p // 2
     
     def rsi_momentum_bearish(self):
         """Check if RSI has bearish momentum over recent candles"""
-        if len(self.rsi_seq) < self.hp['rsi_momentum_period'] + 1:
-            return False
-        
-        recent_rsi = self.rsi_seq[-self.hp['rsi_momentum_period']-1:]
-        # Check if RSI is generally decreasing over the momentum period
-        momentum_count = 0
-        for i in range(1, len(recent_rsi)):
-            if recent_rsi[i] < recent_rsi[i-1]:
-                momentum_count += 1
-        
         # Require majority of recent candles to show downward RSI momentum
-        return momentum_count >= (len(recent_rsi) - 1) // 2
+        return self._rsi_momentum()[1] >= self._mom_p // 2
     
     @property
+    @cached
     def trend_direction(self):
         """Determine overall trend direction: 1=bullish, -1=bearish, 0=neutral"""
-        if not self.hp['use_trend_filter']:
+        if not self._use_trend:
             return 0  # No trend filter
         
         # Primary trend from fast/slow EMA
@@ -152,86 +377,100 @@ class RSI5MinStrategy(Strategy):
         return 0  # Conflicting signals = neutral
     
     @property
+    @cached
     def volume_confirmation(self):
         """Check if current volume is above average (bullish confirmation)"""
-        if not self.hp['use_volume_filter']:
+        if not self._use_vol:
             return True  # Volume filter disabled
         
         return self.volume > self.volume_sma * 1.2  # 20% above average
     
     def get_position_entry_candle(self):
         """Get the candle index when position was opened"""
-        if hasattr(self, '_entry_candle_index'):
-            return self._entry_candle_index
-        return None
+        return None if self._entry_candle_index < 0 else self._entry_candle_index
 
     # ========== ENTRY LOGIC ==========
     
     def should_long(self) -> bool:
         """
-        Comprehensive long entry conditions:
+        Comprehensive long entry conditions, cheapest checks first:
         1. RSI oversold
-        2. RSI showing bullish momentum
-        3. Trend alignment (if enabled)
-        4. Volume confirmation (if enabled)
-        """
-        # Core RSI condition - must be oversold
-        if self.rsi >= self.hp['rsi_oversold']:
-            return False
-        
-        # RSI momentum confirmation - RSI must be turning up
-        if not self.rsi_momentum_bullish():
-            return False
+        2. Volume confirmation (if enabled)
+        3. Price near or above fast EMA (if trend filter enabled)
+        4. Trend alignment (if enabled)
+        5. RSI showing bullish momentum
         
-        # Trend filter - only long when trend is bullish or neutral
-        if self.hp['use_trend_filter'] and self.trend_direction == -1:
-            return False
-        
-        # Volume confirmation (if enabled)
-        if not self.volume_confirmation:
-            return False
-        
-        # Additional confirmation: price should be near or above fast EMA for bullish bias
-        if self.hp['use_trend_filter'] and self.close < self.ema_fast * 0.998:
-            return False
-        
-        return True
+        Runs the specialized check of the current filter config, which
+        _bind_hp() binds over this method for the whole run.
+        """
+        return getattr(self, self._ENTRY_VARIANTS[(bool(self._use_trend), bool(self._use_vol))][0])()
     
     def should_short(self) -> bool:
         """
-        Comprehensive short entry conditions:
+        Comprehensive short entry conditions, cheapest checks first:
         1. RSI overbought
-        2. RSI showing bearish momentum
-        3. Trend alignment (if enabled)
-        4. Volume confirmation (if enabled)
+        2. Volume confirmation (if enabled)
+        3. Price near or below fast EMA (if trend filter enabled)
+        4. Trend alignment (if enabled)
+        5. RSI showing bearish momentum
         
         Note: Automatically disabled for spot trading exchanges
         """
-        # Disable shorting for spot exchanges (Jesse requirement)
-        if self.exchange_type == 'spot':
-            return False
-        
-        # Core RSI condition - must be overbought
-        if self.rsi <= self.hp['rsi_overbought']:
-            return False
-        
-        # RSI momentum confirmation - RSI must be turning down
-        if not self.rsi_momentum_bearish():
-            return False
-        
-        # Trend filter - only short when trend is bearish or neutral
-        if self.hp['use_trend_filter'] and self.trend_direction == 1:
-            return False
-        
-        # Volume confirmation (if enabled)
-        if not self.volume_confirmation:
-            return False
-        
-        # Additional confirmation: price should be near or below fast EMA for bearish bias
-        if self.hp['use_trend_filter'] and self.close > self.ema_fast * 1.002:
-            return False
-        
-        return True
+        return getattr(self, self._ENTRY_VARIANTS[(bool(self._use_trend), bool(self._use_vol))][1])()
+
+    # ========== SPECIALIZED ENTRY LOGIC ==========
+    # One check per filter config, each made of the shared conditions below with
+    # the disabled filters left out. sweep() vectorizes the same conditions.
+    
+    def _long_rsi_ok(self):
+        """RSI oversold"""
+        return self.rsi < self._rsi_os
+    
+    def _short_rsi_ok(self):
+        """Shorting possible (not on spot exchanges) and RSI overbought"""
+        return self.exchange_type != 'spot' and self.rsi > self._rsi_ob
+    
+    def _long_trend_ok(self):
+        """Price near or above fast EMA and trend not bearish"""
+        return not self.close < self.ema_fast * 0.998 and self.trend_direction != -1
+    
+    def _short_trend_ok(self):
+        """Price near or below fast EMA and trend not bullish"""
+        return not self.close > self.ema_fast * 1.002 and self.trend_direction != 1
+    
+    def _should_long_trend_vol(self) -> bool:
+        return (
+            self._long_rsi_ok() and
+            self.volume_confirmation and
+            self._long_trend_ok() and
+            self.rsi_momentum_bullish()
+        )
+    
+    def _should_long_trend_novol(self) -> bool:
+        return self._long_rsi_ok() and self._long_trend_ok() and self.rsi_momentum_bullish()
+    
+    def _should_long_notrend_vol(self) -> bool:
+        return self._long_rsi_ok() and self.volume_confirmation and self.rsi_momentum_bullish()
+    
+    def _should_long_notrend_novol(self) -> bool:
+        return self._long_rsi_ok() and self.rsi_momentum_bullish()
+    
+    def _should_short_trend_vol(self) -> bool:
+        return (
+            self._short_rsi_ok() and
+            self.volume_confirmation and
+            self._short_trend_ok() and
+            self.rsi_momentum_bearish()
+        )
+    
+    def _should_short_trend_novol(self) -> bool:
+        return self._short_rsi_ok() and self._short_trend_ok() and self.rsi_momentum_bearish()
+    
+    def _should_short_notrend_vol(self) -> bool:
+        return self._short_rsi_ok() and self.volume_confirmation and self.rsi_momentum_bearish()
+    
+    def _should_short_notrend_novol(self) -> bool:
+        return self._short_rsi_ok() and self.rsi_momentum_bearish()
 
     # ========== POSITION MANAGEMENT ==========
     
@@ -241,7 +480,7 @@ class RSI5MinStrategy(Strategy):
         entry_price = self.close
         
         # Calculate stop loss based on ATR
-        stop_loss_price = entry_price - (self.atr * self.hp['stop_loss_atr_mult'])
+        stop_loss_price = entry_price - self.atr * self._sl_mult
         
         # Use appropriate capital source based on exchange type
         if self.exchange_type == 'futures':
@@ -253,18 +492,18 @@ class RSI5MinStrategy(Strategy):
         # Calculate position size based on risk percentage
         qty = utils.risk_to_qty(
             capital,
-            self.hp['risk_percentage'],
+            self._risk_pct,
             entry_price,
             stop_loss_price,
-            fee_rate=self.fee_rate
+            fee_rate=self._fee_rate
         )
         
-        # Safety check: ensure we don't exceed available capital
-        max_position_size = capital * self.hp['max_capital_per_trade']  # Configurable max capital per trade
-        max_qty = utils.size_to_qty(max_position_size, entry_price, fee_rate=self.fee_rate)
+        # Safety check: ensure we don't exceed available capital (configurable max capital per trade).
+        # Closed form of utils.size_to_qty(): fee-adjusted size over price, floored to 3 decimals
+        max_qty = math.floor(capital * self._max_cap_size_factor / entry_price * 1000) / 1000
         
         # Use the smaller of calculated qty and max safe qty
-        final_qty = min(qty, max_qty)
+        final_qty = qty if qty < max_qty else max_qty
         
         # Additional safety: ensure minimum position size
         if final_qty <= 0:
@@ -286,7 +525,7 @@ class RSI5MinStrategy(Strategy):
         entry_price = self.close
         
         # Calculate stop loss based on ATR
-        stop_loss_price = entry_price + (self.atr * self.hp['stop_loss_atr_mult'])
+        stop_loss_price = entry_price + self.atr * self._sl_mult
         
         # Use appropriate capital source (futures only for shorts)
         # For futures with leverage, use leveraged available margin
@@ -295,18 +534,18 @@ class RSI5MinStrategy(Strategy):
         # Calculate position size based on risk percentage
         qty = utils.risk_to_qty(
             capital,
-            self.hp['risk_percentage'],
+            self._risk_pct,
             entry_price,
             stop_loss_price,
-            fee_rate=self.fee_rate
+            fee_rate=self._fee_rate
         )
         
-        # Safety check: ensure we don't exceed available capital
-        max_position_size = capital * self.hp['max_capital_per_trade']  # Configurable max capital per trade
-        max_qty = utils.size_to_qty(max_position_size, entry_price, fee_rate=self.fee_rate)
+        # Safety check: ensure we don't exceed available capital (configurable max capital per trade).
+        # Closed form of utils.size_to_qty(): fee-adjusted size over price, floored to 3 decimals
+        max_qty = math.floor(capital * self._max_cap_size_factor / entry_price * 1000) / 1000
         
         # Use the smaller of calculated qty and max safe qty
-        final_qty = min(qty, max_qty)
+        final_qty = qty if qty < max_qty else max_qty
         
         # Additional safety: ensure minimum position size
         if final_qty <= 0:
@@ -328,19 +567,28 @@ class RSI5MinStrategy(Strategy):
         """Set stop loss and take profit when position opens"""
         entry_price = self.position.entry_price
         
-        if self.is_long:
-            # Long position stops
-            stop_loss_price = entry_price - (self.atr * self.hp['stop_loss_atr_mult'])
-            take_profit_price = entry_price + (self.atr * self.hp['take_profit_atr_mult'])
-        else:
-            # Short position stops
-            stop_loss_price = entry_price + (self.atr * self.hp['stop_loss_atr_mult'])
-            take_profit_price = entry_price - (self.atr * self.hp['take_profit_atr_mult'])
+        # Update ATR with the latest candle and derive both exit prices in one kernel call.
+        # Stops sit on the losing side of the entry, targets on the winning side.
+        candles = self.candles
+        state = self._stream_state('atr', self.timeframe, candles, self._atr_period)
+        _, stop_loss_price, take_profit_price = compute_sl_tp(
+            state.atr_value,
+            state.true_range(candles[-1]),
+            min(state.count + 1, self._atr_period),
+            entry_price,
+            self._sl_mult,
+            self._tp_mult,
+            1 if self.is_long else -1
+        )
         
         # Set stop loss and take profit
         self.stop_loss = self.position.qty, stop_loss_price
         self.take_profit = self.position.qty, take_profit_price
     
+    def on_close_position(self, order, closed_trade) -> None:
+        """Forget the entry candle once the position is closed"""
+        self._entry_candle_index = -1
+    
     def update_position(self) -> None:
         """Manage open positions with dynamic exits"""
         if not self.position.is_open:
@@ -358,46 +606,40 @@ class RSI5MinStrategy(Strategy):
                     return
         
         # Time-based exit - close position if held too long
-        entry_candle = self.get_position_entry_candle()
-        if entry_candle is not None:
-            candles_held = self.index - entry_candle
-            if candles_held >= self.hp['max_hold_candles']:
-                self.liquidate()
-                return
-        
-        # RSI-based exits
-        if self.is_long:
-            # Exit long when RSI reaches overbought or shows strong bearish momentum
-            if (self.rsi >= self.hp['rsi_overbought'] or 
-                (self.rsi > 60 and self.rsi_momentum_bearish())):
-                self.liquidate()
-                return
-        
-        elif self.is_short:
-            # Exit short when RSI reaches oversold or shows strong bullish momentum
-            if (self.rsi <= self.hp['rsi_oversold'] or 
-                (self.rsi < 40 and self.rsi_momentum_bullish())):
-                self.liquidate()
-                return
-        
-        # Trend reversal exit
-        if self.hp['use_trend_filter']:
-            if self.is_long and self.trend_direction == -1:
-                # Strong bearish trend developed, exit long
-                if self.close < self.ema_fast:
-                    self.liquidate()
-                    return
-            
-            elif self.is_short and self.trend_direction == 1:
-                # Strong bullish trend developed, exit short
-                if self.close > self.ema_fast:
-                    self.liquidate()
-                    return
+        if self._entry_candle_index >= 0 and self.index - self._entry_candle_index >= self._max_hold:
+            self.liquidate()
+            return
+        
+        # RSI and trend exits mirror each other for longs and shorts, so they are
+        # tested in the direction of the position: side * (x - y) > 0 means x moved
+        # past y in favour of the position
+        side = 1 if self.is_long else -1
+        rsi = self.rsi
+        rsi_gain = side * (rsi - 50)
+        rsi_target = self._rsi_ob - 50 if side == 1 else 50 - self._rsi_os
+        
+        if (
+            # RSI reached the opposite extreme (overbought for longs, oversold for shorts)
+            rsi_gain >= rsi_target or
+            # or is past 60/40 with strong momentum against the position
+            (rsi_gain > 10 and (self.rsi_momentum_bearish() if side == 1 else self.rsi_momentum_bullish())) or
+            # Trend reversal exit: opposite trend developed and price crossed the fast EMA
+            (self._use_trend and self.trend_direction == -side and side * (self.close - self.ema_fast) < 0)
+        ):
+            self.liquidate()
     
     # ========== OPTIONAL: WATCHLIST FOR MONITORING ==========
     
     def watch_list(self):
         """Return watchlist for live trading monitoring"""
+        # The entry signals below re-run should_long/should_short, which is
+        # wasted work in backtests where nobody is watching
+        if self.is_backtesting:
+            return []
+        return self._live_watch_list()
+    
+    def _live_watch_list(self):
+        """Watchlist items shown while live trading"""
         watch_items = [
             ('RSI', round(self.rsi, 2)),
             ('Trend', self.trend_direction),
@@ -419,4 +661,115 @@ class RSI5MinStrategy(Strategy):
                 if self.liquidation_price is not None:
                     watch_items.append(('Liquidation Price', round(self.liquidation_price, 2)))
         
-        return watch_items
\ No newline at end of file
+        return watch_items
+
+    # ========== VECTORIZED PARAMETER SWEEP ==========
+    
+    @classmethod
+    def sweep(cls, candles, grid, htf_candles=None, allow_short=True, timeframe='5m'):
+        """
+        Screen many hyperparameter configs on one candle series at once.
+        
+        Indicators are computed once per distinct set of indicator periods and
+        the entry rules are broadcast over a (bars x configs) matrix. A position
+        is held for max_hold_candles after its latest entry signal; stops,
+        take-profits and position sizing are not simulated, so this ranks
+        configs for the real (Jesse) backtests rather than replacing them.
+        
+        `candles` are on `timeframe`. `htf_candles` are the 15m candles for
+        higher_tf_ema (only completed candles are used); without them the
+        current timeframe is used, like the strategy's own fallback.
+        
+        Returns one dict per config of `grid`, in order.
+        """
+        defaults = {dna['name']: dna['default'] for dna in cls().hyperparameters()}
+        configs = [{**defaults, **hp} for hp in grid]
+        log_ret = np.diff(np.log(candles[:, 2]))
+        results = [None] * len(configs)
+        
+        for members, long_sig, short_sig in cls._sweep_signals(candles, configs, htf_candles, timeframe):
+            if not allow_short:
+                short_sig[:] = False
+            hold = np.array([configs[j]['max_hold_candles'] for j in members])
+            
+            position = ((_window_count(long_sig, hold) > 0).astype(np.int8) -
+                        (_window_count(short_sig, hold) > 0).astype(np.int8))
+            # A position taken on a bar's close earns the next bar's return
+            equity = np.cumsum(position[:-1] * log_ret[:, None], axis=0)
+            drawdown = equity - np.maximum.accumulate(equity, axis=0)
+            
+            for col, j in enumerate(members):
+                results[j] = {
+                    'hp': configs[j],
+                    'total_return': float(np.expm1(equity[-1, col])) if len(equity) else 0.0,
+                    'max_drawdown': float(np.expm1(drawdown[:, col].min())) if len(equity) else 0.0,
+                    'long_signals': int(long_sig[:, col].sum()),
+                    'short_signals': int(short_sig[:, col].sum()),
+                    'exposure': float(np.mean(position[:, col] != 0)),
+                }
+        
+        return results
+    
+    @classmethod
+    def _sweep_signals(cls, candles, configs, htf_candles, timeframe):
+        """
+        Per-bar entry signals of `configs` (complete hyperparameter dicts), the
+        same checks should_long/should_short make on each bar.
+        
+        Yields (config indices, long signals, short signals) for each group of
+        configs sharing indicator periods, the signals as (bars x configs) arrays.
+        """
+        close = candles[:, 2]
+        # The strategy's EMAs run over the trailing indicator window only (see _ema)
+        window = int(jh.get_config('env.data.warmup_candles_num', 240))
+        
+        groups = {}
+        for j, hp in enumerate(configs):
+            periods = (hp['rsi_period'], hp['rsi_momentum_period'], hp['trend_ema_fast'],
+                       hp['trend_ema_slow'], hp['higher_tf_period'])
+            groups.setdefault(periods, []).append(j)
+        
+        volume_ok = candles[:, 5] > ta.sma(candles, period=20, source_type='volume', sequential=True) * 1.2
+        if htf_candles is not None:
+            # Completed 15m candles at the close of each bar
+            htf_end = htf_candles[:, 0] + jh.timeframe_to_one_minutes('15m') * 60_000
+            bar_end = candles[:, 0] + jh.timeframe_to_one_minutes(timeframe) * 60_000
+            htf_idx = np.searchsorted(htf_end, bar_end, side='right') - 1
+        
+        for (rsi_p, mom_p, fast_p, slow_p, htf_p), members in groups.items():
+            rsi_full = ta.rsi(candles, period=rsi_p, sequential=True)
+            ema_fast_full = ema_last_windows(close, fast_p, window)
+            ema_slow_full = ema_last_windows(close, slow_p, window)
+            if htf_candles is None:
+                htf_ema_full = ema_last_windows(close, htf_p, window)
+            else:
+                # Index -1 (no completed 15m candle yet) picks the appended NaN
+                htf_ema = np.append(ema_last_windows(htf_candles[:, 2], htf_p, window), np.nan)
+                htf_ema_full = htf_ema[htf_idx]
+            
+            # RSI momentum: rising/falling steps over the last mom_p changes
+            steps = np.sign(np.diff(rsi_full, prepend=np.nan))[:, None]
+            mom_window = np.array([mom_p])
+            momentum_up = (_window_count(steps > 0, mom_window) >= mom_p // 2)[:, 0]
+            momentum_down = (_window_count(steps < 0, mom_window) >= mom_p // 2)[:, 0]
+            # Same warm-up requirement as the strategy (mom_p + 1 RSI values)
+            momentum_up[:mom_p] = momentum_down[:mom_p] = False
+            
+            primary = np.where(ema_fast_full > ema_slow_full, 1, -1)
+            htf_trend = np.where(close > htf_ema_full, 1, -1)
+            trend = np.where(primary == htf_trend, primary, 0)
+            long_trend_ok = ~(close < ema_fast_full * 0.998) & (trend != -1)
+            short_trend_ok = ~(close > ema_fast_full * 1.002) & (trend != 1)
+            
+            hps = [configs[j] for j in members]
+            oversold = np.array([hp['rsi_oversold'] for hp in hps])[None, :]
+            overbought = np.array([hp['rsi_overbought'] for hp in hps])[None, :]
+            use_trend = np.array([bool(hp['use_trend_filter']) for hp in hps])[None, :]
+            use_vol = np.array([bool(hp['use_volume_filter']) for hp in hps])[None, :]
+            
+            volume_pass = volume_ok[:, None] | ~use_vol
+            long_sig = ((rsi_full[:, None] < oversold) & volume_pass &
+                        (long_trend_ok[:, None] | ~use_trend) & momentum_up[:, None])
+            short_sig = ((rsi_full[:, None] > overbought) & volume_pass &
+                         (short_trend_ok[:, None] | ~use_trend) & momentum_down[:, None])
+            yield members, long_sig, short_sig
@@ -0,0 +1,85 @@
+"""
+Numba-compiled indicator kernels used by RSI5MinStrategy.
+
+The step kernels fold a single new observation into the running state of an
+indicator and return the updated state, so the strategy never has to re-scan
+the candle history on each bar. The EMA is the exception: ta.ema seeds it with
+the first close of the trailing indicator window, so ema_last runs over that
+window instead. Numba is optional: without it the kernels run as plain Python.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that leaves the function interpreted"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, nogil=True)
+def rsi_step(prev_avg_gain, prev_avg_loss, delta, period):
+    """Wilder-smoothed average gain/loss after one more price change"""
+    gain = delta if delta > 0.0 else 0.0
+    loss = -delta if delta < 0.0 else 0.0
+    avg_gain = (prev_avg_gain * (period - 1) + gain) / period
+    avg_loss = (prev_avg_loss * (period - 1) + loss) / period
+    return avg_gain, avg_loss
+
+
+@njit(cache=True, nogil=True)
+def ema_last(values, period):
+    """
+    Latest EMA of `values`, seeded with the first value like ta.ema (NaN with
+    fewer than `period` values)
+    """
+    n = values.shape[0]
+    if n < period:
+        return np.nan
+    alpha = 2.0 / (period + 1)
+    ema = values[0]
+    for i in range(1, n):
+        ema += alpha * (values[i] - ema)
+    return ema
+
+
+@njit(cache=True, nogil=True)
+def ema_last_windows(values, period, window):
+    """ema_last over the trailing `window` values at every position of `values`"""
+    n = values.shape[0]
+    out = np.empty(n)
+    for i in range(n):
+        out[i] = ema_last(values[max(0, i + 1 - window):i + 1], period)
+    return out
+
+
+@njit(cache=True, nogil=True)
+def wilder_atr_step(prev_atr, tr, period):
+    """Wilder-smoothed average true range after one more true range"""
+    return (prev_atr * (period - 1) + tr) / period
+
+
+@njit(cache=True, nogil=True)
+def momentum_updown(values):
+    """Number of rising and falling steps in a sequence"""
+    up = 0
+    down = 0
+    for i in range(1, values.shape[0]):
+        d = values[i] - values[i - 1]
+        up += d > 0.0
+        down += d < 0.0
+    return up, down
+
+
+@njit(cache=True, nogil=True)
+def compute_sl_tp(prev_atr, tr, period, entry_price, sl_mult, tp_mult, side):
+    """
+    ATR after one more true range together with the stop-loss and take-profit
+    prices it implies for a position on `side` (1=long, -1=short)
+    """
+    atr = (prev_atr * (period - 1) + tr) / period
+    stop_loss = entry_price - side * atr * sl_mult
+    take_profit = entry_price + side * atr * tp_mult
+    return atr, stop_loss, take_profit
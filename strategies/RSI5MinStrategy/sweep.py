@@ -0,0 +1,75 @@
+"""
+Parallel hyperparameter sweeps for RSI5MinStrategy.
+
+Every hyperparameter config is an independent backtest, so a grid is spread
+over one worker process per config. The candles are stored once as a .npy
+file and opened with mmap_mode='r' in each worker, so they are not pickled
+into every task. Each worker still holds a private copy of them once the
+backtest starts (research.backtest copies the candle arrays).
+
+Example:
+    np.save('storage/temp/btc_1m.npy', candles)
+    results = run_sweep(grid, 'storage/temp/btc_1m.npy', config, 'Binance Perpetual Futures', 'BTC-USDT')
+"""
+import numpy as np
+from jesse import research
+import jesse.helpers as jh
+
+from . import RSI5MinStrategy
+
+# Timeframe of the higher_tf_ema data route
+HIGHER_TIMEFRAME = '15m'
+
+
+def default_hp():
+    """Default value of every hyperparameter of the strategy"""
+    return {dna['name']: dna['default'] for dna in RSI5MinStrategy().hyperparameters()}
+
+
+def run_config(hp, candles_path, config, exchange, symbol, timeframe='5m', warmup_candles_path=None):
+    """
+    Backtest a single hyperparameter config and return its metrics.
+
+    `hp` may hold only the swept hyperparameters, the rest keep their defaults.
+    `candles_path` (and `warmup_candles_path`) point to .npy files of 1m candles.
+    """
+    # The class rather than its name, which is only importable from the project root
+    routes = [{'exchange': exchange, 'strategy': RSI5MinStrategy, 'symbol': symbol, 'timeframe': timeframe}]
+    data_routes = []
+    if timeframe != HIGHER_TIMEFRAME:
+        data_routes.append({'exchange': exchange, 'symbol': symbol, 'timeframe': HIGHER_TIMEFRAME})
+
+    key = jh.key(exchange, symbol)
+    candles = {key: {'exchange': exchange, 'symbol': symbol, 'candles': np.load(candles_path, mmap_mode='r')}}
+    warmup_candles = None
+    if warmup_candles_path is not None:
+        warmup_candles = {
+            key: {'exchange': exchange, 'symbol': symbol, 'candles': np.load(warmup_candles_path, mmap_mode='r')}
+        }
+
+    result = research.backtest(
+        config,
+        routes,
+        data_routes,
+        candles,
+        warmup_candles,
+        hyperparameters={**default_hp(), **hp},
+    )
+    return result['metrics']
+
+
+def run_sweep(grid, candles_path, config, exchange, symbol, timeframe='5m', warmup_candles_path=None, n_jobs=-1):
+    """
+    Backtest every config of `grid` in parallel (one process per config).
+
+    Returns a list of (hp, metrics) tuples in the order of `grid`.
+    """
+    # joblib is only needed for sweeps, not for running the strategy itself
+    from joblib import Parallel, delayed
+
+    grid = list(grid)
+    metrics = Parallel(n_jobs=n_jobs, backend='loky')(
+        delayed(run_config)(hp, candles_path, config, exchange, symbol, timeframe, warmup_candles_path)
+        for hp in grid
+    )
+    return list(zip(grid, metrics))
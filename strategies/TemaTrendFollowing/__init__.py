@@ -1,8 +1,28 @@
-from jesse.strategies import Strategy
-import jesse.indicators as ta
-from jesse import utils
+from jesse.strategies import Strategy, cached
+import jesse.helpers as jh
+import numpy as np
+
+try:
+    # Ahead-of-time build (see _compile.py), skips the JIT warm-up in every backtest process
+    from ._aot_kernels import tema_chain, atr_adx_cmo, atr_adx_cmo_f4, entry_side, entry_order, exit_prices
+except ImportError:
+    from ._kernels import tema_chain, atr_adx_cmo, entry_side, entry_order, exit_prices
+    # The JIT kernel is compiled for both float64 and float32 columns
+    atr_adx_cmo_f4 = atr_adx_cmo
 
 class TemaTrendFollowing(Strategy):
+    # Feed the ATR/ADX/CMO kernel float32 columns: half the memory traffic, and the
+    # values are only compared to coarse thresholds
+    float32_columns = False
+    
+    # Compile the entry kernels with this run's hyperparameters as constants. Costs a JIT
+    # compile per process (not cached on disk), so it only pays off on long runs.
+    specialize_entry = False
+    
+    def __init__(self):
+        super().__init__()
+        self._hp_bound = False
+    
     def hyperparameters(self):
         return [
             # TEMA periods
@@ -26,107 +46,251 @@ class TemaTrendFollowing(Strategy):
             {'name': 'position_multiplier', 'type': int, 'min': 1, 'max': 5, 'default': 3},
         ]
     
+    def before(self):
+        if not self._hp_bound:
+            self._bind_hp()
+    
+    def _bind_hp(self):
+        """Copy the hyperparameters used on every bar to attributes (hp is only filled after __init__)"""
+        # Trailing window the ta.* indicators slice to (jh.slice_candles), read once instead of per bar
+        self._window = int(jh.get_config('env.data.warmup_candles_num', 240))
+        
+        hp = self.hp
+        # Plain Python scalars, so the hot path never dispatches on numpy scalar types
+        self._tema_short_period = int(hp['tema_short_period'])
+        self._tema_medium_period = int(hp['tema_medium_period'])
+        self._tema_4h_short_period = int(hp['tema_long_4h_short'])
+        self._tema_4h_long_period = int(hp['tema_long_4h_long'])
+        self._adx_th = float(hp['adx_threshold'])
+        self._cmo_up = float(hp['cmo_upper_threshold'])
+        self._cmo_lo = float(hp['cmo_lower_threshold'])
+        self._entry_off = float(hp['entry_atr_offset'])
+        self._sl_mult = float(hp['stop_loss_atr_mult'])
+        self._tp_mult = float(hp['take_profit_atr_mult'])
+        self._risk_pct = float(hp['risk_percentage'])
+        self._pos_mul = int(hp['position_multiplier'])
+        # Packed for the entry kernels, all floats so they get a single tuple type
+        self._entry_hp = (self._adx_th, self._cmo_up, self._cmo_lo, self._entry_off,
+                          self._sl_mult, self._risk_pct, float(self._pos_mul))
+        self._entry_kernels = None
+        if self.specialize_entry:
+            # JIT-only (numba.pycc can't build runtime-generated kernels ahead of time), imported
+            # here so runs on the AOT build never load _kernels and its JIT warm-up
+            from ._kernels import specialized_entry_kernels
+            self._entry_kernels = specialized_entry_kernels(self._entry_hp)
+        self._hp_bound = True
+    
     @property
+    @cached
     def candles_4h(self):
         """Cache 4h candles to avoid multiple API calls"""
-        if not hasattr(self, '_candles_4h'):
-            self._candles_4h = self.get_candles(self.exchange, self.symbol, '4h')
-        return self._candles_4h
+        # Once per bar: get_candles returns a snapshot, so caching it for good
+        # would freeze the 4h series at the first bar
+        return self.get_candles(self.exchange, self.symbol, '4h')
+    
+    @property
+    @cached
+    def _candles(self):
+        """Candles of the route, fetched once per bar"""
+        # Memoized with @cached rather than stored in before(): fills call
+        # on_open_position between executions, after the candles moved on
+        return self.candles
     
     @property
     def short_term_trend(self):
-        tema_short = ta.tema(self.candles, self.hp['tema_short_period'])
-        tema_medium = ta.tema(self.candles, self.hp['tema_medium_period'])
-        return 1 if tema_short > tema_medium else -1
+        return 1 if self.tema_short > self.tema_medium else -1
     
     @property
     def long_term_trend(self):
-        tema_short_4h = ta.tema(self.candles_4h, self.hp['tema_long_4h_short'])
-        tema_long_4h = ta.tema(self.candles_4h, self.hp['tema_long_4h_long'])
-        return 1 if tema_short_4h > tema_long_4h else -1
+        return 1 if self.tema_short_4h > self.tema_long_4h else -1
     
     @property
+    @cached
     def tema_short(self):
-        return ta.tema(self.candles, self.hp['tema_short_period'])
+        return self._tema(self.timeframe, self._candles, self._tema_short_period)
     
     @property
+    @cached
     def tema_medium(self):
-        return ta.tema(self.candles, self.hp['tema_medium_period'])
+        return self._tema(self.timeframe, self._candles, self._tema_medium_period)
     
     @property
+    @cached
     def tema_short_4h(self):
-        return ta.tema(self.candles_4h, self.hp['tema_long_4h_short'])
+        return self._tema('4h', self.candles_4h, self._tema_4h_short_period)
     
     @property
+    @cached
     def tema_long_4h(self):
-        return ta.tema(self.candles_4h, self.hp['tema_long_4h_long'])
+        return self._tema('4h', self.candles_4h, self._tema_4h_long_period)
+    
+    def _tema(self, timeframe, candles, period):
+        """
+        ta.tema of the closes: a TEMA chain over the indicator window, seeded
+        with the window's first close.
+        
+        The value is kept in self.vars with the newest candle it was computed
+        on, as a 4h candle stays the newest one for 240 1m bars and until it
+        ticks (new timestamp or close) the TEMA can't change.
+        """
+        if not len(candles):
+            return np.nan
+        
+        key = ('tema', timeframe, period)
+        newest = (candles[-1, 0], candles[-1, 2])
+        state = self.vars.get(key)
+        if state is not None and state[0] == newest:
+            return state[1]
+        
+        close = candles[-self._window:, 2]
+        e1, e2, e3 = tema_chain(close[1:], 2.0 / (period + 1.0), close[0], close[0], close[0])
+        value = 3 * e1 - 3 * e2 + e3
+        self.vars[key] = (newest, value)
+        return value
+    
+    @property
+    @cached
+    def _columns(self):
+        """Contiguous close, high and low columns of the indicator window"""
+        candles = self._candles[-self._window:]
+        # One copy into a (3, n) C-ordered array turns each column into a stride-1 row
+        dtype = np.float32 if self.float32_columns else np.float64
+        return np.ascontiguousarray(candles[:, 2:5].T, dtype=dtype)
+    
+    @property
+    @cached
+    def _atr_adx_cmo(self):
+        """ATR, ADX and CMO from one pass over the candles"""
+        close, high, low = self._columns
+        kernel = atr_adx_cmo_f4 if self.float32_columns else atr_adx_cmo
+        return kernel(high, low, close, 14, 14, 14)
     
     @property
     def atr(self):
-        return ta.atr(self.candles)
+        return self._atr_adx_cmo[0]
     
     @property
     def adx(self):
-        return ta.adx(self.candles)
+        return self._atr_adx_cmo[1]
     
     @property
     def cmo(self):
-        return ta.cmo(self.candles)
+        return self._atr_adx_cmo[2]
+    
+    @property
+    @cached
+    def _entry(self):
+        """(side, qty, entry price) of this bar's entry, side 0 when there is none"""
+        # ADX first: a single fused ATR/ADX/CMO pass over the window rejects
+        # nearly every bar, while the route TEMAs take two passes (the 4h ones
+        # are memoized, but the trend needs both). 'not >' also rejects NaN.
+        atr, adx, cmo = self._atr_adx_cmo
+        if not adx > self._adx_th:
+            return 0, 0.0, 0.0
+        trend = self.short_term_trend
+        if trend != self.long_term_trend:
+            return 0, 0.0, 0.0
+        hp = self._entry_hp
+        kernels = self._entry_kernels
+        side = entry_side(trend, adx, cmo, hp) if kernels is None else kernels[0](trend, adx, cmo)
+        if not side:
+            return 0, 0.0, 0.0
+        
+        # Price, margin and fee rate are only read once there is an order to size
+        price, margin, fee_rate = self.price, self.available_margin, self.fee_rate
+        if kernels is None:
+            qty, entry_price = entry_order(side, atr, price, margin, fee_rate, hp)
+        else:
+            qty, entry_price = kernels[1](side, atr, price, margin, fee_rate)
+        return side, qty, entry_price
     
     def should_long(self) -> bool:
-        return (
-            self.short_term_trend == 1 and 
-            self.long_term_trend == 1 and 
-            self.adx > self.hp['adx_threshold'] and 
-            self.cmo > self.hp['cmo_upper_threshold']
-        )
+        return self._entry[0] == 1
     
     def should_short(self) -> bool:
-        return (
-            self.short_term_trend == -1 and 
-            self.long_term_trend == -1 and 
-            self.adx > self.hp['adx_threshold'] and 
-            self.cmo < self.hp['cmo_lower_threshold']
-        )
+        return self._entry[0] == -1
     
     def go_long(self):
-        entry_price = self.price - (self.atr * self.hp['entry_atr_offset'])
-        stop_loss_price = entry_price - (self.atr * self.hp['stop_loss_atr_mult'])
-        
-        qty = utils.risk_to_qty(
-            self.available_margin, 
-            self.hp['risk_percentage'], 
-            entry_price, 
-            stop_loss_price, 
-            fee_rate=self.fee_rate
-        )
-        
-        self.buy = qty * self.hp['position_multiplier'], entry_price
+        self.buy = self._entry[1], self._entry[2]
     
     def go_short(self):
-        entry_price = self.price + (self.atr * self.hp['entry_atr_offset'])
-        stop_loss_price = entry_price + (self.atr * self.hp['stop_loss_atr_mult'])
-        
-        qty = utils.risk_to_qty(
-            self.available_margin, 
-            self.hp['risk_percentage'], 
-            entry_price, 
-            stop_loss_price, 
-            fee_rate=self.fee_rate
-        )
-        
-        self.sell = qty * self.hp['position_multiplier'], entry_price
+        self.sell = self._entry[1], self._entry[2]
     
     def should_cancel_entry(self) -> bool:
         return True
     
     def on_open_position(self, order) -> None:
-        atr_stop = self.atr * self.hp['stop_loss_atr_mult']
-        atr_tp = self.atr * self.hp['take_profit_atr_mult']
-        
         if self.is_long:
-            self.stop_loss = self.position.qty, self.position.entry_price - atr_stop
-            self.take_profit = self.position.qty, self.position.entry_price + atr_tp
+            side = 1
         elif self.is_short:
-            self.stop_loss = self.position.qty, self.position.entry_price + atr_stop
-            self.take_profit = self.position.qty, self.position.entry_price - atr_tp
\ No newline at end of file
+            side = -1
+        else:
+            return
+        
+        qty = self.position.qty
+        stop_loss, take_profit = exit_prices(side, self.position.entry_price, self.atr, self._sl_mult, self._tp_mult)
+        self.stop_loss = qty, stop_loss
+        self.take_profit = qty, take_profit
+    
+    @staticmethod
+    def batch_trend(fast, slow):
+        """short_term_trend/long_term_trend over arrays of TEMA values: 1 where fast > slow, else -1"""
+        # Branchless; np.sign would give 0 on ties where the scalar form gives -1
+        return np.where(np.asarray(fast) > np.asarray(slow), 1, -1).astype(np.int8)
+    
+    @staticmethod
+    def batch_tema(candles, periods):
+        """
+        Latest TEMA of `candles` for every period of `periods` at once.
+        
+        Meant for optimizer drivers screening a grid of TEMA periods: the periods
+        are spread over threads instead of one backtest per period. Values agree
+        with the strategy's TEMAs over the same candles up to rounding.
+        """
+        # JIT-only (numba.pycc can't build parallel kernels ahead of time), imported
+        # here so backtests on the AOT build never load _kernels
+        from ._kernels import tema_last_batch
+        
+        periods = np.ascontiguousarray(periods, dtype=np.int64)
+        out = np.empty(len(periods))
+        if len(candles):
+            window = candles[-int(jh.get_config('env.data.warmup_candles_num', 240)):]
+            tema_last_batch(np.ascontiguousarray(window[:, 2]), periods, out)
+        else:
+            out[:] = np.nan
+        return out
+    
+    @classmethod
+    def batch_entry_sides(cls, candles, candles_4h, grid):
+        """
+        Entry signal on the latest bar for every hyperparameter config of `grid` at once.
+        
+        `grid` is a list of hp dicts (missing keys keep their defaults). TEMAs are
+        computed once per distinct period and the entry rules are evaluated as
+        boolean masks over all configs. Returns an int8 array in the order of
+        `grid`: 1 for a long entry, -1 for a short one, 0 for none.
+        """
+        defaults = {dna['name']: dna['default'] for dna in cls().hyperparameters()}
+        configs = [{**defaults, **hp} for hp in grid]
+        
+        def column(name):
+            return np.array([hp[name] for hp in configs])
+        
+        def tema(series, name):
+            periods, inverse = np.unique(column(name), return_inverse=True)
+            return cls.batch_tema(series, periods)[inverse]
+        
+        short_term = cls.batch_trend(tema(candles, 'tema_short_period'), tema(candles, 'tema_medium_period'))
+        long_term = cls.batch_trend(tema(candles_4h, 'tema_long_4h_short'), tema(candles_4h, 'tema_long_4h_long'))
+        
+        # ADX/CMO don't depend on the grid, one kernel pass serves every config
+        window = candles[-int(jh.get_config('env.data.warmup_candles_num', 240)):]
+        close, high, low = np.ascontiguousarray(window[:, 2:5].T, dtype=np.float64)
+        _, adx, cmo = atr_adx_cmo(high, low, close, 14, 14, 14)
+        
+        ok = (
+            (short_term == long_term) &
+            (adx > column('adx_threshold')) &
+            np.where(short_term == 1, cmo > column('cmo_upper_threshold'), cmo < column('cmo_lower_threshold'))
+        )
+        return np.where(ok, short_term, 0).astype(np.int8)
\ No newline at end of file
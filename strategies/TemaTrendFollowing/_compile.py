@@ -0,0 +1,31 @@
+"""
+Ahead-of-time build of the TemaTrendFollowing kernels.
+
+Every backtest process of an optimization session otherwise pays numba's JIT
+(or cache load) cost on its first bar. Run once per machine/Python version:
+
+    python -m strategies.TemaTrendFollowing._compile
+
+This writes the _aot_kernels extension module next to this file; the strategy
+imports it when present and falls back to the @njit kernels otherwise. The
+build is a snapshot of _kernels.py, so rerun it after changing a kernel.
+"""
+import os
+
+from numba.pycc import CC
+
+from . import _kernels
+
+cc = CC('_aot_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+cc.export('tema_chain', 'UniTuple(f8, 3)(f8[:], f8, f8, f8, f8)')(_kernels.tema_chain.py_func)
+cc.export('atr_adx_cmo', 'UniTuple(f8, 3)(f8[::1], f8[::1], f8[::1], i8, i8, i8)')(_kernels.atr_adx_cmo.py_func)
+# pycc exports one signature per name, the float32 build of float32_columns gets its own
+cc.export('atr_adx_cmo_f4', 'UniTuple(f8, 3)(f4[::1], f4[::1], f4[::1], i8, i8, i8)')(_kernels.atr_adx_cmo.py_func)
+cc.export('entry_side', 'i8(i8, f8, f8, UniTuple(f8, 7))')(_kernels.entry_side.py_func)
+cc.export('entry_order', 'UniTuple(f8, 2)(i8, f8, f8, f8, f8, UniTuple(f8, 7))')(_kernels.entry_order.py_func)
+cc.export('exit_prices', 'UniTuple(f8, 2)(i8, f8, f8, f8, f8)')(_kernels.exit_prices.py_func)
+
+if __name__ == '__main__':
+    cc.compile()
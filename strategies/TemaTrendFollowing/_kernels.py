@@ -0,0 +1,231 @@
+"""
+Numba-compiled indicator kernels used by TemaTrendFollowing.
+
+The kernels take plain 1-D columns of the candle array and return the latest
+indicator values, following the same recurrences as jesse's ta.atr, ta.adx and
+ta.cmo. Numba is optional: without it the kernels run as plain Python.
+
+The indicator loops are built with fast-math, the sizing and order kernels are
+not, so their prices and qty stay identical to jesse.utils.
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that leaves the function interpreted"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Fast-math for the indicator loops, minus the no-NaN/no-inf assumptions: the
+# kernels return NaN during warm-up and callers test for it
+FASTMATH = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+# Eager float64 and float32 builds of the column kernels (periods are ints)
+ATR_ADX_CMO_SIGNATURES = [
+    'UniTuple(f8, 3)(f8[::1], f8[::1], f8[::1], i8, i8, i8)',
+    'UniTuple(f8, 3)(f4[::1], f4[::1], f4[::1], i8, i8, i8)',
+]
+
+
+@njit(cache=True, nogil=True, fastmath=FASTMATH, boundscheck=False)
+def tema_chain(values, alpha, e1, e2, e3):
+    """EMA chain of a TEMA after folding in `values`"""
+    for i in range(values.shape[0]):
+        e1 += alpha * (values[i] - e1)
+        e2 += alpha * (e1 - e2)
+        e3 += alpha * (e2 - e3)
+    return e1, e2, e3
+
+
+@njit(parallel=True, cache=True, fastmath=FASTMATH, boundscheck=False)
+def tema_last_batch(close, periods, out):
+    """
+    Latest TEMA of `close` for each of `periods` into `out`, one period per
+    thread. Like ta.tema, the chain is seeded with the first close.
+    """
+    n = close.shape[0]
+    for j in prange(periods.shape[0]):
+        alpha = 2.0 / (periods[j] + 1.0)
+        e1 = e2 = e3 = close[0]
+        for i in range(1, n):
+            e1 += alpha * (close[i] - e1)
+            e2 += alpha * (e1 - e2)
+            e3 += alpha * (e2 - e3)
+        out[j] = 3 * e1 - 3 * e2 + e3
+
+
+@njit(cache=True, nogil=True, fastmath=FASTMATH, boundscheck=False)
+def true_range(high, low, close, i):
+    """True range of candle `i` (high - low for the first candle)"""
+    tr = high[i] - low[i]
+    if i > 0:
+        tr = max(tr, abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+    return tr
+
+
+@njit(cache=True, nogil=True, fastmath=FASTMATH, boundscheck=False)
+def _dx(plus_dm, minus_dm):
+    """Directional index from the smoothed +DM/-DM (the smoothed TR cancels out)"""
+    total = plus_dm + minus_dm
+    return 0.0 if total == 0.0 else 100.0 * abs(plus_dm - minus_dm) / total
+
+
+@njit(ATR_ADX_CMO_SIGNATURES, cache=True, nogil=True, fastmath=FASTMATH, boundscheck=False)
+def atr_adx_cmo(high, low, close, atr_period, adx_period, cmo_period):
+    """
+    Latest ATR, ADX and CMO from a single pass over the candles.
+
+    Each value is NaN until there are enough candles, like ta.atr, ta.adx and
+    ta.cmo: at least `atr_period` candles, more than 2 * `adx_period` and more
+    than `cmo_period` respectively.
+    """
+    n = close.shape[0]
+    atr = 0.0
+    # Wilder sums of +DM/-DM, seeded with the plain sum of the first `adx_period` moves
+    plus_sum = 0.0
+    minus_sum = 0.0
+    dx_sum = 0.0
+    adx = 0.0
+    cmo_up = 0.0
+    cmo_down = 0.0
+    for i in range(n):
+        # ATR: mean of the first `atr_period` true ranges, then Wilder smoothing
+        tr = true_range(high, low, close, i)
+        if i < atr_period:
+            atr += tr
+            if i == atr_period - 1:
+                atr /= atr_period
+        else:
+            atr = (atr * (atr_period - 1) + tr) / atr_period
+
+        if i == 0:
+            continue
+
+        # CMO: only the last `cmo_period` price changes count
+        if i >= n - cmo_period:
+            d = close[i] - close[i - 1]
+            if d > 0.0:
+                cmo_up += d
+            else:
+                cmo_down -= d
+
+        up = high[i] - high[i - 1]
+        down = low[i - 1] - low[i]
+        plus_dm = up if up > down and up > 0.0 else 0.0
+        minus_dm = down if down > up and down > 0.0 else 0.0
+        if i <= adx_period:
+            plus_sum += plus_dm
+            minus_sum += minus_dm
+        else:
+            plus_sum += plus_dm - plus_sum / adx_period
+            minus_sum += minus_dm - minus_sum / adx_period
+        if i >= adx_period:
+            dx = _dx(plus_sum, minus_sum)
+            if i < 2 * adx_period:
+                dx_sum += dx
+            elif i == 2 * adx_period:
+                # ta.adx seeds with the mean DX of the previous `adx_period` candles
+                adx = dx_sum / adx_period
+            else:
+                adx = (adx * (adx_period - 1) + dx) / adx_period
+
+    if n < atr_period:
+        atr = np.nan
+    if n <= 2 * adx_period:
+        adx = np.nan
+    if n <= cmo_period:
+        cmo = np.nan
+    else:
+        total = cmo_up + cmo_down
+        cmo = 0.0 if total == 0.0 else 100.0 * (cmo_up - cmo_down) / total
+    return atr, adx, cmo
+
+
+@njit(cache=True, nogil=True)
+def risk_qty(capital, risk_percentage, entry_price, stop_loss_price, fee_rate):
+    """utils.risk_to_qty (precision=8) with the same operation order, so the qty matches exactly"""
+    risk_per_qty = abs(entry_price - stop_loss_price)
+    if risk_per_qty == 0:
+        raise ValueError('risk cannot be zero')
+    size = min(((risk_percentage / 100 * capital) / risk_per_qty) * entry_price, capital)
+    # risk_to_qty and size_to_qty both take the fees off the size
+    if fee_rate != 0:
+        size = size * (1 - fee_rate * 3)
+        size = size * (1 - fee_rate * 3)
+    return np.floor(size / entry_price * 1e8) / 1e8
+
+
+# Inlined into the specialized kernels, so their hp constants fold into these bodies
+@njit(cache=True, nogil=True, inline='always')
+def entry_side(trend, adx, cmo, hp):
+    """
+    Side of this bar's entry once both TEMA trends agree on `trend` (1=up, -1=down).
+
+    `hp` is (adx_threshold, cmo_upper, cmo_lower, entry_atr_offset,
+    stop_loss_atr_mult, risk_percentage, position_multiplier). Returns
+    `trend` when ADX and CMO confirm it, 0 when there is no entry.
+    """
+    adx_th, cmo_up, cmo_lo = hp[0], hp[1], hp[2]
+    if not adx > adx_th:  # also rejects NaN while warming up
+        return 0
+    if trend == 1:
+        if not cmo > cmo_up:
+            return 0
+    elif not cmo < cmo_lo:
+        return 0
+    return trend
+
+
+@njit(cache=True, nogil=True, inline='always')
+def entry_order(side, atr, price, margin, fee_rate, hp):
+    """(qty, entry price) of an entry on `side`, with `hp` as in entry_side()"""
+    entry_off, sl_mult, risk_pct, pos_mul = hp[3], hp[4], hp[5], hp[6]
+    # Limit entry `entry_atr_offset` ATRs on the favourable side of the price
+    entry_price = price - side * atr * entry_off
+    stop_loss_price = entry_price - side * atr * sl_mult
+    qty = risk_qty(margin, risk_pct, entry_price, stop_loss_price, fee_rate)
+    return qty * pos_mul, entry_price
+
+
+# Specialized entry kernels per hp tuple, compiled at most once per process
+_SPECIALIZED_ENTRY_KERNELS = {}
+
+
+def specialized_entry_kernels(hp):
+    """
+    entry_side and entry_order with `hp` compiled in as constants.
+
+    The wrappers are generated as source with every hyperparameter written out
+    as a float literal and jitted, so LLVM can fold the thresholds and
+    multipliers into the inlined kernels. They take the kernels' arguments
+    minus `hp`.
+    """
+    kernels = _SPECIALIZED_ENTRY_KERNELS.get(hp)
+    if kernels is None:
+        # repr() round-trips floats exactly, so results match the kernels called with `hp`
+        constants = ', '.join(repr(float(value)) for value in hp)
+        source = (
+            'def entry_side_specialized(trend, adx, cmo):\n'
+            f'    return entry_side(trend, adx, cmo, ({constants}))\n'
+            'def entry_order_specialized(side, atr, price, margin, fee_rate):\n'
+            f'    return entry_order(side, atr, price, margin, fee_rate, ({constants}))\n'
+        )
+        namespace = {'entry_side': entry_side, 'entry_order': entry_order}
+        exec(source, namespace)
+        # exec'd source has no file for numba's on-disk cache, hence no cache=True
+        kernels = _SPECIALIZED_ENTRY_KERNELS[hp] = (
+            njit(nogil=True)(namespace['entry_side_specialized']),
+            njit(nogil=True)(namespace['entry_order_specialized']),
+        )
+    return kernels
+
+
+@njit(cache=True, nogil=True)
+def exit_prices(side, entry_price, atr, sl_mult, tp_mult):
+    """Stop-loss and take-profit prices of a position on `side` (1=long, -1=short)"""
+    return entry_price - side * atr * sl_mult, entry_price + side * atr * tp_mult
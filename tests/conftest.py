@@ -0,0 +1,28 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# The strategies are imported as the top-level `strategies` package, like Jesse does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# First candle of every series, aligned to 4h so all timeframes start on a boundary
+START_TIMESTAMP = (1_600_000_000_000 // 14_400_000) * 14_400_000
+
+
+def random_walk_candles(count, seed=0, start=START_TIMESTAMP, timeframe_ms=60_000):
+    """Synthetic OHLCV candles (Jesse's column order) following a random walk"""
+    rng = np.random.default_rng(seed)
+    close = 20000 * np.exp(np.cumsum(rng.normal(0, 0.001, count)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.001, count))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.001, count))
+    volume = rng.uniform(1, 10, count)
+    timestamp = start + np.arange(count) * timeframe_ms
+    return np.column_stack([timestamp, open_, close, high, low, volume])
+
+
+@pytest.fixture
+def make_candles():
+    return random_walk_candles
@@ -0,0 +1,229 @@
+import importlib.util
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip('jesse')
+import jesse.indicators as ta
+from jesse.exceptions import RouteNotFound
+from jesse import utils
+
+import strategies.RSI5MinStrategy as strategy_module
+from strategies.RSI5MinStrategy import RSI5MinStrategy, _kernels
+
+
+def _strategy(candles, htf_candles=None, hp=None, **attributes):
+    """
+    Strategy instance outside of a backtest, reading `candles` as its route
+    candles and `htf_candles` as the 15m ones, with `hp` over the defaults
+    """
+    attributes = {'candles': candles, 'fee_rate': 0.001, **attributes}
+    strategy = type('Strategy', (RSI5MinStrategy,), attributes)()
+    strategy.exchange, strategy.symbol, strategy.timeframe = 'Sandbox', 'BTC-USDT', '5m'
+    strategy.get_candles = lambda exchange, symbol, timeframe: htf_candles
+    strategy._htf_available = htf_candles is not None
+    strategy.hp = {dna['name']: dna['default'] for dna in strategy.hyperparameters()}
+    strategy.hp.update(hp or {})
+    strategy._bind_hp()
+    return strategy
+
+
+@pytest.mark.parametrize('count', [20, 150, 239, 240, 1000])
+def test_emas_match_ta_ema(make_candles, count):
+    candles = make_candles(count, timeframe_ms=300_000)
+    htf_candles = make_candles(count, seed=1, timeframe_ms=900_000)
+    hp = {'trend_ema_fast': 34, 'trend_ema_slow': 200, 'higher_tf_period': 200}
+    strategy = _strategy(candles, htf_candles, hp)
+    fallback = _strategy(candles, None, hp)
+
+    # ta.ema runs over the trailing 240 candles, seeded with the first close of
+    # that window, and is NaN while there are fewer than `period` candles
+    expected = [ta.ema(candles, 34), ta.ema(candles, 200), ta.ema(htf_candles, 200), ta.ema(candles, 200)]
+    actual = [strategy.ema_fast, strategy.ema_slow, strategy.higher_tf_ema, fallback.higher_tf_ema]
+    np.testing.assert_allclose(actual, expected, rtol=1e-12)
+
+
+@pytest.mark.parametrize('period', [10, 14, 20])
+@pytest.mark.parametrize('seed', range(3))
+def test_streamed_rsi_and_atr_stay_within_the_seed_weight(make_candles, period, seed):
+    candles = make_candles(2000, seed=seed, timeframe_ms=300_000)
+    strategy = _strategy(candles, hp={'rsi_period': period, 'atr_period': period})
+
+    # Weight left on the seed of ta.rsi/ta.atr's 240-candle window
+    rtol = ((period - 1) / period) ** (240 - period)
+    assert strategy.rsi == pytest.approx(ta.rsi(candles, period), rel=rtol)
+    assert strategy.atr == pytest.approx(ta.atr(candles, period), rel=rtol)
+
+
+def test_higher_tf_ema_is_only_recomputed_when_the_15m_candle_ticks(make_candles, monkeypatch):
+    candles = make_candles(300, timeframe_ms=300_000)
+    htf_candles = make_candles(300, seed=1, timeframe_ms=900_000)
+    strategy = _strategy(candles, htf_candles[:-1])
+    assert strategy.higher_tf_ema == pytest.approx(ta.ema(htf_candles[:-1], 100), rel=1e-12)
+
+    # Next bar, same 15m candles: the memoized value, no EMA pass
+    strategy._clear_cached_methods()
+    with monkeypatch.context() as patch:
+        patch.setattr(strategy_module, 'ema_last', None)
+        assert strategy.higher_tf_ema == pytest.approx(ta.ema(htf_candles[:-1], 100), rel=1e-12)
+
+    # A forming candle's close ticks, then a new candle shows up
+    ticked = htf_candles[:-1].copy()
+    ticked[-1, 2] *= 1.01
+    for htf in (ticked, htf_candles):
+        strategy.get_candles = lambda exchange, symbol, timeframe, htf=htf: htf
+        strategy._clear_cached_methods()
+        assert strategy.higher_tf_ema == pytest.approx(ta.ema(htf, 100), rel=1e-12)
+
+
+@pytest.mark.parametrize('has_route', [True, False])
+def test_15m_route_is_probed_once(make_candles, has_route):
+    probes = []
+
+    def get_candles(exchange, symbol, timeframe):
+        probes.append(timeframe)
+        if not has_route:
+            raise RouteNotFound(symbol, timeframe)
+        return htf_candles
+
+    candles = make_candles(300, timeframe_ms=300_000)
+    htf_candles = make_candles(100, seed=1, timeframe_ms=900_000)
+    strategy = _strategy(candles)
+    strategy._htf_available, strategy.get_candles = None, get_candles
+
+    strategy.before()
+    strategy.before()
+
+    assert strategy._htf_available is has_route
+    assert probes == ['15m']
+    expected = ta.ema(htf_candles if has_route else candles, 100)
+    assert strategy.higher_tf_ema == pytest.approx(expected, rel=1e-12)
+
+
+def test_kernels_run_without_numba(monkeypatch):
+    values = np.array([50.0, 52.0, 51.5, 53.0, 49.0])
+    expected = (_kernels.momentum_updown(values), _kernels.ema_last(values, 3),
+                _kernels.rsi_step(1.0, 2.0, -0.5, 14))
+
+    # A None entry makes `import numba` raise ImportError
+    monkeypatch.setitem(sys.modules, 'numba', None)
+    spec = importlib.util.spec_from_file_location('_interpreted_kernels', _kernels.__file__)
+    interpreted = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(interpreted)
+
+    assert interpreted.momentum_updown(values) == expected[0]
+    assert interpreted.ema_last(values, 3) == pytest.approx(expected[1])
+    assert interpreted.rsi_step(1.0, 2.0, -0.5, 14) == pytest.approx(expected[2])
+
+
+def test_rsi_momentum_uses_the_warmup_history_from_the_first_bar(make_candles):
+    candles = make_candles(500, timeframe_ms=300_000)
+    strategy = _strategy(candles)
+    strategy.before()
+
+    expected = ta.rsi(candles, period=14, sequential=True)[-4:]
+    np.testing.assert_allclose(strategy.rsi_seq, expected, rtol=1e-6)
+    steps = np.diff(expected)
+    assert strategy.rsi_momentum_bullish() == ((steps > 0).sum() >= 1)
+    assert strategy.rsi_momentum_bearish() == ((steps < 0).sum() >= 1)
+
+
+def test_sweep_signals_match_the_entry_checks(make_candles):
+    candles = make_candles(1200, timeframe_ms=300_000)
+    # 15m candles of the same series
+    groups = candles.reshape(-1, 3, 6)
+    htf_candles = np.column_stack([groups[:, 0, 0], groups[:, 0, 1], groups[:, -1, 2], groups[:, :, 3].max(axis=1),
+                                   groups[:, :, 4].min(axis=1), groups[:, :, 5].sum(axis=1)])
+    # Thresholds close to 50 so the trend filter gets to decide on plenty of bars
+    grid = [
+        {'use_trend_filter': trend, 'use_volume_filter': volume, 'trend_ema_slow': 200, 'higher_tf_period': 200,
+         'rsi_oversold': 45, 'rsi_overbought': 55}
+        for trend in (True, False) for volume in (True, False)
+    ]
+    configs = [{dna['name']: dna['default'] for dna in RSI5MinStrategy().hyperparameters()} | hp for hp in grid]
+    (members, long_sig, short_sig), = RSI5MinStrategy._sweep_signals(candles, configs, htf_candles, '5m')
+    # 15m candles completed by the close of each 5m bar
+    htf_count = np.searchsorted(htf_candles[:, 0] + 900_000, candles[:, 0] + 300_000, side='right')
+
+    # Like in a backtest, the strategy runs from the first candle after the warm-up ones
+    warmup = 240
+    for col, j in enumerate(members):
+        strategy = _strategy(candles[:warmup + 1], htf_candles, grid[j], exchange_type='futures')
+        longs, shorts = [], []
+        for i in range(warmup, len(candles)):
+            type(strategy).candles, type(strategy).current_candle = candles[:i + 1], candles[i]
+            strategy.get_candles = lambda exchange, symbol, timeframe, count=htf_count[i]: htf_candles[:count]
+            strategy.index = i
+            strategy._clear_cached_methods()
+            strategy.before()
+            longs.append(strategy.should_long())
+            shorts.append(strategy.should_short())
+
+        np.testing.assert_array_equal(long_sig[warmup:, col], longs)
+        np.testing.assert_array_equal(short_sig[warmup:, col], shorts)
+        assert sum(longs) and sum(shorts)
+
+
+@pytest.mark.parametrize('side, rsi, bullish, bearish, trend, close, use_trend, exits', [
+    # Longs: RSI overbought, past 60 with bearish momentum, or bearish trend below the fast EMA
+    (1, 70.0, False, False, 0, 100.0, True, True),
+    (1, 69.9, False, False, 0, 100.0, True, False),
+    (1, 60.1, False, True, 0, 100.0, True, True),
+    (1, 60.0, False, True, 0, 100.0, True, False),
+    (1, 65.0, True, False, 0, 100.0, True, False),
+    (1, 55.0, False, False, -1, 99.9, True, True),
+    (1, 55.0, False, False, -1, 100.1, True, False),
+    (1, 55.0, False, False, 0, 99.9, True, False),
+    (1, 55.0, False, False, 1, 99.9, True, False),
+    (1, 55.0, False, False, -1, 99.9, False, False),
+    # Shorts mirror them: RSI oversold, below 40 with bullish momentum, or bullish trend above the fast EMA
+    (-1, 30.0, False, False, 0, 100.0, True, True),
+    (-1, 30.1, False, False, 0, 100.0, True, False),
+    (-1, 39.9, True, False, 0, 100.0, True, True),
+    (-1, 40.0, True, False, 0, 100.0, True, False),
+    (-1, 35.0, False, True, 0, 100.0, True, False),
+    (-1, 45.0, False, False, 1, 100.1, True, True),
+    (-1, 45.0, False, False, 1, 99.9, True, False),
+    (-1, 45.0, False, False, 0, 100.1, True, False),
+    (-1, 45.0, False, False, -1, 100.1, True, False),
+    (-1, 45.0, False, False, 1, 100.1, False, False),
+])
+def test_update_position_exits(make_candles, side, rsi, bullish, bearish, trend, close, use_trend, exits):
+    liquidations = []
+    strategy = _strategy(
+        make_candles(50, timeframe_ms=300_000), hp={'use_trend_filter': use_trend},
+        is_long=side == 1, is_short=side == -1, exchange_type='spot',
+        rsi=rsi, close=close, ema_fast=100.0, trend_direction=trend,
+        rsi_momentum_bullish=lambda self: bullish, rsi_momentum_bearish=lambda self: bearish,
+        liquidate=lambda self: liquidations.append(self),
+    )
+    strategy.position = SimpleNamespace(is_open=True)
+
+    strategy.update_position()
+
+    assert len(liquidations) == exits
+
+
+@pytest.mark.parametrize('side', [1, -1])
+def test_entry_qty_is_capped_like_size_to_qty(make_candles, side):
+    rng = np.random.default_rng(0)
+    strategy = _strategy(make_candles(50, timeframe_ms=300_000), exchange_type='futures', buy=None, sell=None)
+    for _ in range(2000):
+        capital, price = rng.uniform(10, 1e6), rng.uniform(0.01, 1e5)
+        atr, fee_rate = price * rng.uniform(1e-4, 0.05), rng.choice([0.0, 0.0004, 0.001])
+        hp = {'risk_percentage': rng.uniform(0.5, 2.0), 'max_capital_per_trade': rng.uniform(0.05, 0.5)}
+        type(strategy).leveraged_available_margin, type(strategy).close, type(strategy).atr = capital, price, atr
+        strategy.fee_rate = fee_rate
+        strategy.hp.update(hp)
+        strategy._bind_hp()
+        strategy.buy = strategy.sell = None
+
+        (strategy.go_long if side == 1 else strategy.go_short)()
+
+        stop = price - side * atr * strategy.hp['stop_loss_atr_mult']
+        qty = min(utils.risk_to_qty(capital, hp['risk_percentage'], price, stop, fee_rate=fee_rate),
+                  utils.size_to_qty(capital * hp['max_capital_per_trade'], price, fee_rate=fee_rate))
+        order = strategy.buy if side == 1 else strategy.sell
+        assert order == ((qty, price) if qty > 0 else None)
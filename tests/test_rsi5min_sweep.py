@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('jesse')
+pytest.importorskip('joblib')
+
+from strategies.RSI5MinStrategy.sweep import run_config, run_sweep
+
+CONFIG = {
+    'starting_balance': 10_000, 'fee': 0.001, 'type': 'futures', 'futures_leverage': 2,
+    'futures_leverage_mode': 'cross', 'exchange': 'Sandbox', 'warm_up_candles': 240,
+}
+# Loose RSI thresholds so a few days of candles are enough for some trades
+HP = {'rsi_oversold': 45, 'rsi_overbought': 55, 'use_trend_filter': False}
+
+
+@pytest.fixture
+def candle_paths(tmp_path, make_candles):
+    """.npy files of 1m trading candles and of the 240 5m candles of warm-up before them"""
+    candles = make_candles(6000)
+    warmup_candles = make_candles(1200, seed=1, start=int(candles[0, 0]) - 1200 * 60_000)
+    paths = tmp_path / 'candles.npy', tmp_path / 'warmup_candles.npy'
+    np.save(paths[0], candles)
+    np.save(paths[1], warmup_candles)
+    return str(paths[0]), str(paths[1])
+
+
+def test_run_config_backtests_the_strategy(candle_paths):
+    candles_path, warmup_candles_path = candle_paths
+    metrics = run_config(HP, candles_path, CONFIG, 'Sandbox', 'BTC-USDT', warmup_candles_path=warmup_candles_path)
+    assert metrics['total'] > 0
+
+
+def test_run_sweep_keeps_the_grid_order(candle_paths):
+    candles_path, warmup_candles_path = candle_paths
+    grid = [{**HP, 'max_hold_candles': 20}, {**HP, 'max_hold_candles': 100}]
+
+    results = run_sweep(grid, candles_path, CONFIG, 'Sandbox', 'BTC-USDT',
+                        warmup_candles_path=warmup_candles_path, n_jobs=1)
+
+    assert [hp for hp, _ in results] == grid
+    assert results[0][1]['total'] != results[1][1]['total']
+    for hp, metrics in results:
+        expected = run_config(hp, candles_path, CONFIG, 'Sandbox', 'BTC-USDT', warmup_candles_path=warmup_candles_path)
+        assert metrics['total'] == expected['total']
+        assert metrics['net_profit'] == pytest.approx(expected['net_profit'])
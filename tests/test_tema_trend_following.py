@@ -0,0 +1,143 @@
+import importlib.util
+import os
+import subprocess
+import sys
+import textwrap
+
+import numpy as np
+import pytest
+
+pytest.importorskip('jesse')
+import jesse.indicators as ta
+
+import strategies.TemaTrendFollowing as tema_module
+from strategies.TemaTrendFollowing import TemaTrendFollowing
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _strategy(candles, candles_4h=None, hp=None, **attributes):
+    """
+    Strategy instance outside of a backtest, reading `candles` as its route
+    candles and `candles_4h` as the 4h ones, with `hp` over the defaults
+    """
+    attributes = {'_candles': candles, 'candles_4h': candles_4h, 'price': candles[-1, 2],
+                  'available_margin': 10_000.0, 'fee_rate': 0.001, **attributes}
+    strategy = type('Strategy', (TemaTrendFollowing,), attributes)()
+    strategy.timeframe = '1m'
+    strategy.hp = {dna['name']: dna['default'] for dna in strategy.hyperparameters()}
+    strategy.hp.update(hp or {})
+    strategy._bind_hp()
+    return strategy
+
+
+@pytest.mark.parametrize('count', [1, 150, 240, 2000])
+def test_temas_match_ta_tema(make_candles, count):
+    candles = make_candles(count)
+    candles_4h = make_candles(count, seed=1, timeframe_ms=14_400_000)
+    hp = {'tema_short_period': 5, 'tema_medium_period': 120, 'tema_long_4h_short': 40, 'tema_long_4h_long': 80}
+    strategy = _strategy(candles, candles_4h, hp)
+
+    # ta.tema runs over the trailing 240 candles, seeded with the first close of that window
+    expected = [ta.tema(candles, 5), ta.tema(candles, 120), ta.tema(candles_4h, 40), ta.tema(candles_4h, 80)]
+    actual = [strategy.tema_short, strategy.tema_medium, strategy.tema_short_4h, strategy.tema_long_4h]
+    np.testing.assert_allclose(actual, expected, rtol=1e-12)
+    np.testing.assert_allclose(TemaTrendFollowing.batch_tema(candles, [5, 120]), expected[:2], rtol=1e-12)
+
+
+@pytest.fixture(scope='module')
+def aot_build(tmp_path_factory):
+    """Path of an _aot_kernels extension module built from the current kernels"""
+    pytest.importorskip('numba.pycc')
+    from strategies.TemaTrendFollowing import _compile
+
+    output_dir = tmp_path_factory.mktemp('aot')
+    default_dir, _compile.cc.output_dir = _compile.cc.output_dir, str(output_dir)
+    try:
+        _compile.cc.compile()
+    finally:
+        _compile.cc.output_dir = default_dir
+    return next(output_dir.glob('_aot_kernels*'))
+
+
+def test_aot_build_skips_the_jit_kernels(aot_build):
+    # A fresh interpreter, as in a backtest worker, with the build where the strategy imports it from
+    script = textwrap.dedent(f"""
+        import importlib.util, sys
+        sys.path.insert(0, {ROOT!r})
+        spec = importlib.util.spec_from_file_location('strategies.TemaTrendFollowing._aot_kernels', {str(aot_build)!r})
+        sys.modules[spec.name] = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(sys.modules[spec.name])
+        import strategies.TemaTrendFollowing
+        print('strategies.TemaTrendFollowing._kernels' in sys.modules)
+    """)
+    result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1] == 'False'
+
+
+def test_float32_columns_run_on_the_aot_build(aot_build, monkeypatch, make_candles):
+    spec = importlib.util.spec_from_file_location('_aot_kernels', aot_build)
+    aot = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(aot)
+    monkeypatch.setattr(tema_module, 'atr_adx_cmo', aot.atr_adx_cmo)
+    monkeypatch.setattr(tema_module, 'atr_adx_cmo_f4', aot.atr_adx_cmo_f4)
+
+    candles = make_candles(500)
+    expected = (ta.atr(candles), ta.adx(candles), ta.cmo(candles))
+    for float32 in (False, True):
+        strategy = _strategy(candles, float32_columns=float32)
+        np.testing.assert_allclose(strategy._atr_adx_cmo, expected, rtol=1e-4 if float32 else 1e-9)
+
+
+def test_batch_entry_sides_match_the_scalar_entry(make_candles):
+    candles = make_candles(2000)
+    candles_4h = make_candles(300, seed=1, timeframe_ms=14_400_000)
+    # Thresholds around this bar's ADX/CMO, so some configs enter and some don't
+    adx, cmo = ta.adx(candles), ta.cmo(candles)
+    grid = [
+        {'tema_short_period': short, 'tema_medium_period': medium, 'tema_long_4h_short': short_4h,
+         'adx_threshold': adx + adx_offset, 'cmo_upper_threshold': abs(cmo) + cmo_offset,
+         'cmo_lower_threshold': -abs(cmo) - cmo_offset}
+        for short in (5, 20) for medium in (50, 120) for short_4h in (10, 40)
+        for adx_offset in (-1, 1) for cmo_offset in (-1, 1)
+    ]
+
+    sides = TemaTrendFollowing.batch_entry_sides(candles, candles_4h, grid)
+
+    expected = [_strategy(candles, candles_4h, hp)._entry[0] for hp in grid]
+    np.testing.assert_array_equal(sides, expected)
+    assert 0 in expected and set(expected) - {0}
+
+
+@pytest.mark.parametrize('specialize_entry', [False, True])
+def test_margin_is_only_read_for_an_entry(make_candles, specialize_entry):
+    reads = []
+
+    def available_margin(self):
+        reads.append(1)
+        return 10_000.0
+
+    candles = make_candles(2000)
+    candles_4h = make_candles(300, seed=1, timeframe_ms=14_400_000)
+    adx = ta.adx(candles)
+    hp = {'cmo_upper_threshold': -100, 'cmo_lower_threshold': 100}
+    attributes = {'available_margin': property(available_margin), 'specialize_entry': specialize_entry}
+
+    no_entry = _strategy(candles, candles_4h, {**hp, 'adx_threshold': adx + 1}, **attributes)
+    assert no_entry._entry == (0, 0.0, 0.0)
+    assert not reads
+
+    entry = _strategy(candles, candles_4h, {**hp, 'adx_threshold': adx - 1}, **attributes)
+    assert entry._entry[0] != 0 and entry._entry[1] > 0
+    assert len(reads) == 1
+
+
+def test_adx_rejects_before_the_trends_are_computed(make_candles):
+    def short_term_trend(self):
+        raise AssertionError('trend computed on a bar ADX rejects')
+
+    candles = make_candles(2000)
+    hp = {'adx_threshold': ta.adx(candles) + 1}
+    strategy = _strategy(candles, make_candles(300, seed=1, timeframe_ms=14_400_000), hp,
+                         short_term_trend=property(short_term_trend))
+    assert strategy._entry == (0, 0.0, 0.0)